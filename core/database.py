@@ -1,16 +1,18 @@
 # core/database.py
-from math import e
-from sqlalchemy import select, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import event, select, delete, exists, or_
+from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from core.config import settings
-from typing import TypeVar, Callable, Coroutine, Any
-import asyncio
+from typing import Callable, Coroutine, Any, Literal, Optional
 from functools import wraps
 
 # Импортируем модели для регистрации в Base.metadata
 from models.base import Base  # Импортируем Base из пакета models
-from models.product import Product as ProductORM, Category as CategoryORM, Tag as TagORM
+from models.product import (
+    Product as ProductORM,
+    Category as CategoryORM,
+    Tag as TagORM,
+)
 from schemas.product import (
     CategoryCreate,
     Category,
@@ -25,6 +27,10 @@ from schemas.product import (
 DATABASE_URL = settings.DATABASE_URL
 
 
+class ProductNotFoundError(ValueError):
+    """Продукт с указанным ID не найден (остальные ошибки данных - обычный ValueError)"""
+
+
 def async_with_transaction(
     func: Callable[..., Coroutine[Any, Any, Any]],
 ) -> Callable[..., Coroutine[Any, Any, Any]]:
@@ -57,6 +63,28 @@ def async_with_transaction(
 #  echo=True — включает логирование SQL-запросов в консоль
 engine = create_async_engine(DATABASE_URL, echo=True)
 
+
+def _sqlite_unicode_lower(value: Any) -> Any:
+    """lower() для SQLite: встроенная понижает регистр только у ASCII"""
+    return value.lower() if isinstance(value, str) else value
+
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_sqlite_functions(dbapi_connection, connection_record) -> None:
+        # Подменяем встроенную lower() - иначе ILIKE/icontains не находит
+        # кириллицу в другом регистре ("телефон" vs "Телефон")
+        dbapi_connection.create_function(
+            "lower", 1, _sqlite_unicode_lower, deterministic=True
+        )
+        # По умолчанию SQLite не проверяет внешние ключи и не выполняет
+        # ON DELETE CASCADE / SET NULL из моделей - включаем для каждого соединения
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 # Создание фабрики асинхронных сессий
 AsyncSessionLocal = async_sessionmaker(
     # bind - это движок, с которым будут работать сессии
@@ -67,6 +95,26 @@ AsyncSessionLocal = async_sessionmaker(
     class_=AsyncSession,  # Используем асинхронную сессию
 )
 
+
+def _create_missing_indexes(sync_conn) -> None:
+    """
+    Создание индексов, которых ещё нет в БД.
+    create_all не трогает существующие таблицы, поэтому индексы, добавленные
+    в модели позже, на старой БД без этого шага не появятся.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            # checkfirst - пропускаем уже существующие, ddl_if индекса учитывается
+            index.create(sync_conn, checkfirst=True)
+
+
+async def init_db() -> None:
+    """Создание таблиц по моделям, унаследованным от Base, и недостающих индексов."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+
+
 # AsyncSession - тип для аннотаций
 
 # Все синхронные запросы в бд станут асинхронными
@@ -192,7 +240,7 @@ async def product_create(session: AsyncSession, product_data: ProductCreate) ->
     stmt = (
         select(ProductORM)
         .where(ProductORM.id == new_product.id)
-        .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
+        .options(joinedload(ProductORM.category), selectinload(ProductORM.tags))
     )
 
     # Выполняем запрос и получаем один полностью загруженный объект
@@ -206,22 +254,73 @@ async def product_create(session: AsyncSession, product_data: ProductCreate) ->
 ######################## Delete операции ########################
 
 
+async def _category_delete_if_empty(
+    session: AsyncSession, category_id: int
+) -> Literal["ok", "not_found", "has_products"]:
+    """
+    Удаление категории по ID, только если к ней не привязаны продукты.
+
+    Проверка и удаление выполняются одним запросом DELETE ... WHERE NOT EXISTS.
+    Второй запрос делается только если ничего не удалилось — чтобы отличить
+    отсутствующую категорию от категории с продуктами.
+    """
+    stmt = (
+        delete(CategoryORM)
+        .where(
+            CategoryORM.id == category_id,
+            ~exists().where(ProductORM.category_id == category_id),
+        )
+        .returning(CategoryORM.id)
+    )
+    deleted_id = await session.scalar(stmt)
+    if deleted_id is not None:
+        return "ok"
+
+    # Ничего не удалили - выясняем почему
+    category_exists = await session.scalar(
+        select(exists().where(CategoryORM.id == category_id))
+    )
+    return "has_products" if category_exists else "not_found"
+
+
 @async_with_transaction
 async def category_delete(session: AsyncSession, category_id: int) -> None:
     """
     Удаление категории по ID.
+    У продуктов этой категории category_id становится NULL (ondelete="SET NULL").
 
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param category_id: ID категории для удаления
     """
-    category = await session.get(CategoryORM, category_id)
-    if not category:
+    # Удаление и проверка существования одним запросом, без предварительного SELECT.
+    # category_id у продуктов обнулит ON DELETE SET NULL
+    deleted_id = await session.scalar(
+        delete(CategoryORM)
+        .where(CategoryORM.id == category_id)
+        .returning(CategoryORM.id)
+    )
+    if deleted_id is None:
+        # Декоратор откатит транзакцию
         raise ValueError(f"Категория с ID={category_id} не найдена")
-
-    await session.delete(category)
     # logger.info(f"✅ Категория с ID={category_id} удалёна")
 
 
+@async_with_transaction
+async def category_delete_if_empty(
+    session: AsyncSession, category_id: int
+) -> Literal["ok", "not_found", "has_products"]:
+    """
+    Удаление категории по ID, только если к ней не привязаны продукты.
+    Статус вместо исключения - маршрут удаления категории (его пока нет)
+    может отдать по нему 404 или 409.
+
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param category_id: ID категории для удаления
+    :return: "ok" - удалена, "not_found" - не найдена, "has_products" - есть продукты
+    """
+    return await _category_delete_if_empty(session, category_id)
+
+
 @async_with_transaction
 async def tag_delete(session: AsyncSession, tag_id: int) -> None:
     """
@@ -230,11 +329,14 @@ async def tag_delete(session: AsyncSession, tag_id: int) -> None:
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param tag_id: ID тега для удаления
     """
-    tag = await session.get(TagORM, tag_id)
-    if not tag:
+    # Удаление и проверка существования одним запросом, без предварительного SELECT.
+    # Связи в product_tag_association удалит ON DELETE CASCADE
+    deleted_id = await session.scalar(
+        delete(TagORM).where(TagORM.id == tag_id).returning(TagORM.id)
+    )
+    if deleted_id is None:
+        # Декоратор откатит транзакцию
         raise ValueError(f"Тег с ID={tag_id} не найден")
-
-    await session.delete(tag)
     # logger.info(f"✅ Тег с ID={tag_id} удалён")
 
 
@@ -246,11 +348,14 @@ async def product_delete(session: AsyncSession, product_id: int) -> None:
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param product_id: ID продукта для удаления
     """
-    product = await session.get(ProductORM, product_id)
-    if not product:
+    # Удаление и проверка существования одним запросом, без предварительного SELECT.
+    # Связи в product_tag_association удалит ON DELETE CASCADE
+    deleted_id = await session.scalar(
+        delete(ProductORM).where(ProductORM.id == product_id).returning(ProductORM.id)
+    )
+    if deleted_id is None:
+        # Декоратор откатит транзакцию
         raise ValueError(f"Продукт с ID={product_id} не найден")
-
-    await session.delete(product)
     # logger.info(f"✅ Продукт с ID={product_id} удалён")
 
 
@@ -289,21 +394,25 @@ async def tag_get_by_id(session: AsyncSession, tag_id: int) -> Tag:
 
 
 @async_with_transaction
-async def product_get_by_id(session: AsyncSession, product_id: int) -> Product:
+async def product_get_by_id(
+    session: AsyncSession, product_id: int
+) -> Optional[Product]:
     """
     Получение продукта по ID.
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param product_id: ID продукта для получения
-    :return: Product с id, name, description, category и tags продукта
+    :return: Product с id, name, description, category и tags продукта или None, если не найден
     """
+    # Категория - один объект, её дешевле подтянуть JOIN'ом в том же запросе
     stmt = (
         select(ProductORM)
         .where(ProductORM.id == product_id)
-        .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
+        .options(joinedload(ProductORM.category), selectinload(ProductORM.tags))
     )
     product = await session.scalar(stmt)
-    if not product:
-        raise ValueError(f"Продукт с ID={product_id} не найден")
+    # Отсутствие продукта - не ошибка, решение принимает вызывающий код
+    if product is None:
+        return None
     return Product.model_validate(product)
 
 
@@ -314,9 +423,10 @@ async def categories_get_all(session: AsyncSession) -> list[Category]:
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :return: Список всех категорий
     """
-    stmt = select(CategoryORM)
-    categories = await session.scalars(stmt)
-    return [Category.model_validate(cat) for cat in categories]
+    # Выбираем только нужные колонки - строки не превращаются в ORM-объекты
+    stmt = select(CategoryORM.id, CategoryORM.name)
+    categories = await session.execute(stmt)
+    return [Category.model_validate(row) for row in categories]
 
 
 @async_with_transaction
@@ -326,9 +436,26 @@ async def tags_get_all(session: AsyncSession) -> list[Tag]:
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :return: Список всех тегов
     """
-    stmt = select(TagORM)
-    tags = await session.scalars(stmt)
-    return [Tag.model_validate(tag) for tag in tags]
+    # Выбираем только нужные колонки - строки не превращаются в ORM-объекты
+    stmt = select(TagORM.id, TagORM.name)
+    tags = await session.execute(stmt)
+    return [Tag.model_validate(row) for row in tags]
+
+
+@async_with_transaction
+async def tags_get_page(
+    session: AsyncSession, skip: int = 0, limit: int = 100
+) -> list[Tag]:
+    """
+    Получение страницы тегов. LIMIT/OFFSET выполняются в БД, а не срезом в Python.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param skip: Сколько тегов пропустить
+    :param limit: Максимальное количество тегов на странице
+    :return: Список тегов, упорядоченных по ID
+    """
+    stmt = select(TagORM.id, TagORM.name).order_by(TagORM.id).offset(skip).limit(limit)
+    tags = await session.execute(stmt)
+    return [Tag.model_validate(row) for row in tags]
 
 
 @async_with_transaction
@@ -339,12 +466,69 @@ async def products_get_all(session: AsyncSession) -> list[Product]:
     :return: Список всех продуктов с категориями и тегами
     """
     stmt = select(ProductORM).options(
-        selectinload(ProductORM.category), selectinload(ProductORM.tags)
+        joinedload(ProductORM.category), selectinload(ProductORM.tags)
     )
     products = await session.scalars(stmt)
     return [Product.model_validate(prod) for prod in products]
 
 
+# Допустимые валюты для сортировки и соответствующие им колонки
+PRICE_COLUMNS = {
+    "shmeckles": ProductORM.price_shmeckles,
+    "flurbos": ProductORM.price_flurbos,
+}
+
+
+@async_with_transaction
+async def products_get_with_filters(
+    session: AsyncSession,
+    search: str = "",
+    sort_currency: str = "",
+    descending: bool = False,
+    has_image: bool = False,
+    skip: int = 0,
+    limit: int = 100,
+) -> list[Product]:
+    """
+    Получение страницы продуктов с фильтрацией и сортировкой на стороне БД.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param search: Подстрока для поиска в названии или описании продукта
+    :param sort_currency: Валюта для сортировки по цене (ключ PRICE_COLUMNS), пустая строка - без сортировки
+    :param descending: Сортировка по убыванию
+    :param has_image: Только продукты с изображением
+    :param skip: Сколько продуктов пропустить
+    :param limit: Максимальное количество продуктов на странице
+    :return: Список продуктов с категориями и тегами
+    """
+    stmt = select(ProductORM).options(
+        joinedload(ProductORM.category), selectinload(ProductORM.tags)
+    )
+
+    if search:
+        # autoescape: % и _ из запроса ищутся как обычные символы, а не как шаблон
+        stmt = stmt.where(
+            or_(
+                ProductORM.name.icontains(search, autoescape=True),
+                ProductORM.description.icontains(search, autoescape=True),
+            )
+        )
+
+    if has_image:
+        stmt = stmt.where(ProductORM.image_url.is_not(None))
+
+    if sort_currency:
+        price_column = PRICE_COLUMNS.get(sort_currency)
+        if price_column is None:
+            raise ValueError(f"Неизвестная валюта для сортировки: {sort_currency}")
+        stmt = stmt.order_by(price_column.desc() if descending else price_column)
+
+    # ID в конце сортировки - чтобы страницы не пересекались при равных ценах
+    stmt = stmt.order_by(ProductORM.id).offset(skip).limit(limit)
+
+    products = await session.scalars(stmt)
+    return [Product.model_validate(prod) for prod in products]
+
+
 @async_with_transaction
 async def products_get_like_name(
     session: AsyncSession, name_substring: str
@@ -367,7 +551,7 @@ async def products_get_like_name(
         )
         # Важно явно использовать options для загрузки связей
         # Потому что join \ outerjoin - для where, а options - для загрузки связей
-    ).options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
+    ).options(joinedload(ProductORM.category), selectinload(ProductORM.tags))
 
     products = await session.scalars(stmt)
     return [Product.model_validate(prod) for prod in products]
@@ -422,10 +606,15 @@ async def product_update(session: AsyncSession, product_data: ProductUpdate) ->
     :param product_data: Данные для обновления продукта
     :return: Обновлённый продукт
     """
-    # Получаем существующий продукт
-    product = await session.get(ProductORM, product_data.id)
+    # Получаем существующий продукт вместе со связями -
+    # без загруженной коллекции tags её нельзя заменить (lazy="raise_on_sql")
+    product = await session.get(
+        ProductORM,
+        product_data.id,
+        options=[joinedload(ProductORM.category), selectinload(ProductORM.tags)],
+    )
     if not product:
-        raise ValueError(f"Продукт с ID={product_data.id} не найден")
+        raise ProductNotFoundError(f"Продукт с ID={product_data.id} не найден")
 
     # Обновляем поля продукта через распаковку DTO
     product_dict = product_data.model_dump(exclude={"category_id", "tag_ids"})
@@ -471,7 +660,7 @@ async def product_update(session: AsyncSession, product_data: ProductUpdate) ->
     stmt = (
         select(ProductORM)
         .where(ProductORM.id == product.id)
-        .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
+        .options(joinedload(ProductORM.category), selectinload(ProductORM.tags))
     )
 
     result = await session.scalars(stmt)
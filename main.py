@@ -1,5 +1,32 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from core.database import engine, init_db
 from routes import products
+from utils.telegram_bot import (
+    close_telegram_bot,
+    start_notification_worker,
+    stop_notification_worker,
+)
+
+
+# Настройка логирования приложения
+logging.basicConfig(level=logging.INFO)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Создаём таблицы и запускаем воркер уведомлений при старте приложения
+    await init_db()
+    start_notification_worker()
+    yield
+    await stop_notification_worker()
+    await close_telegram_bot()
+    # Закрываем соединения пула БД
+    await engine.dispose()
 
 
 # --- Приложение FastAPI ---
@@ -7,6 +34,12 @@ app = FastAPI(
     title="Учебное приложение Python419",
     description="Пример простого API для управления пользователями",
     version="2.0.0",
+    lifespan=lifespan,
+    # Ответы сериализуются orjson (C) вместо стандартного json
+    default_response_class=ORJSONResponse,
 )
 
+# Сжатие ответов больше 1 КБ (списки товаров хорошо сжимаются)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(products.router, prefix="/products", tags=["Товары"])
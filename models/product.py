@@ -1,6 +1,18 @@
 # models/product.py
 from typing import List, Optional
-from sqlalchemy import Column, Table, String, Integer, Float, ForeignKey, Text, Index
+from sqlalchemy import (
+    DDL,
+    Column,
+    Table,
+    String,
+    Integer,
+    Float,
+    ForeignKey,
+    Text,
+    Index,
+    event,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Базовый класс для моделей из того же пакета
@@ -102,4 +114,39 @@ class Product(Base):
     # Составной индекс для частых запросов
     __table_args__ = (
         Index("ix_product_category_price", "category_id", "price_shmeckles"),
+        # Частичный индекс для фильтра has_image - в него попадают только товары с картинкой
+        Index(
+            "ix_product_image_url_not_null",
+            "image_url",
+            sqlite_where=text("image_url IS NOT NULL"),
+            postgresql_where=text("image_url IS NOT NULL"),
+        ),
+    )
+
+
+# Триграммные GIN-индексы для поиска ILIKE '%...%' (только PostgreSQL).
+# B-tree индекс по name для такого поиска не используется
+product_trgm_indexes = (
+    Index(
+        "ix_product_name_trgm",
+        Product.name,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql"),
+    Index(
+        "ix_product_description_trgm",
+        Product.description,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql"),
+)
+
+# Расширение pg_trgm нужно для gin_trgm_ops - создаём его перед каждым
+# триграммным индексом, а не перед таблицей: так оно появится и на старой БД,
+# где таблица уже есть и создаются только недостающие индексы (init_db)
+for _index in product_trgm_indexes:
+    event.listen(
+        _index,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
     )
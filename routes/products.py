@@ -1,17 +1,53 @@
 # routes/products.py
+import hashlib
 from typing import List
 
-import telegram
-from schemas.product import Product, CreateProduct
-from data import products
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from utils.telegram_bot import send_telegram_message
+from pydantic import TypeAdapter
+from schemas.product import Product, ProductCreate, ProductUpdate
+from core.database import (
+    AsyncSessionLocal,
+    ProductNotFoundError,
+    product_create,
+    product_delete,
+    product_get_by_id,
+    product_update,
+    products_get_with_filters,
+)
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from utils.telegram_bot import enqueue_new_product_notification
 
 
 # --- Маршруты API для работы с товарами ---
 
 router = APIRouter()
 
+# Сериализатор списка товаров создаётся один раз при импорте
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[Product])
+
+# Сколько секунд браузер/CDN может не перепроверять карточку товара
+PRODUCT_CACHE_MAX_AGE = 30
+
+
+def _cached_json_response(request: Request, body: bytes) -> Response:
+    """
+    Ответ с ETag и Cache-Control.
+    Если клиент прислал совпадающий If-None-Match - отдаём 304 без тела.
+    """
+    # Слабый ETag: GZipMiddleware меняет байты тела, а смысл ответа тот же
+    opaque_tag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {
+        "ETag": f"W/{opaque_tag}",
+        "Cache-Control": f"public, max-age={PRODUCT_CACHE_MAX_AGE}",
+    }
+
+    # If-None-Match сравнивается слабо (RFC 9110): префикс W/ не учитывается
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in client_tags or opaque_tag in client_tags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 # 1. Получение данных о товаре (детальный просмотр)
 @router.get(
@@ -19,17 +55,16 @@ router = APIRouter()
     response_model=Product,
     summary="Получить данные о товаре",
 )
-async def get_product(product_id: int):
+async def get_product(product_id: int, request: Request):
     """
     Возвращает данные о товаре по его ID.
+    Поддерживает условные запросы по ETag (304 Not Modified).
     """
-    # product = next((item for item in products if item["id"] == product_id), None)
-    # Альтернативный способ поиска товара через list comprehension
-    try:
-        product = [item for item in products if item["id"] == product_id][0]
-    except IndexError:
+    product = await product_get_by_id(AsyncSessionLocal, product_id)
+    if product is None:
         raise HTTPException(status_code=404, detail="Товар не найден")
-    return product
+    # response_model остаётся для документации, а JSON мы формируем сами - для ETag
+    return _cached_json_response(request, product.model_dump_json().encode())
 
 
 # 2. Получение списка всех товаров.
@@ -41,53 +76,54 @@ async def get_product(product_id: int):
     response_model=List[Product],
     summary="Получить список всех товаров",
 )
-async def list_products(search: str = "", sort: str = "", has_image: bool = False):
+async def list_products(
+    search: str = "",
+    sort: str = "",
+    has_image: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
     """
-    Возвращает список всех товаров с возможностью фильтрации и сортировки.
+    Возвращает список всех товаров с возможностью фильтрации, сортировки и пагинации.
     - **search**: Поиск по названию и описанию товара.
-    - **sort**: Сортировка по цене. Формат: `currency_direction` (например, `credits_asc`, `shmeckles_desc`).
+    - **sort**: Сортировка по цене. Формат: `currency_direction` (например, `flurbos_asc`, `shmeckles_desc`).
     - **has_image**: Если True, возвращаются только товары с изображениями.
+    - **skip**: Сколько товаров пропустить.
+    - **limit**: Максимальное количество товаров в ответе.
     """
-    filtered_products = products
-    # products/?search=ПлЮмБуС
-    # Фильтрация по поисковому запросу
-    if search:
-        filtered_products = [
-            item
-            for item in filtered_products
-            if search.lower() in item["name"].lower()
-            or search.lower() in item["description"].lower()
-        ]
-
-    # Фильтрация по наличию изображения
-    if has_image:
-        filtered_products = [item for item in filtered_products if item["image_url"]]
-
-    # Сортировка по цене
-    # products/?sort=credits_asc
+    # products/?sort=flurbos_asc
     # products/?sort=shmeckles_desc
+    currency, descending = "", False
     if sort:
         try:
             currency, direction = sort.split("_")
-            reverse = direction == "desc"
-            # sort - метод списка
-            # key - ключ сортировки, принимает функцию
-            # item - каждый словарь с товаром
-            # item["prices"] - вложенный словарь с ценами
-            # currency - ключ валюты из параметра запроса
-            # float('inf') - бесконечность, чтобы товары без указанной валюты оказались в конце списка
-
-            filtered_products.sort(
-                key=lambda item: item["prices"].get(currency, float("inf")),
-                reverse=reverse,
-            )
         except ValueError:
             raise HTTPException(
                 status_code=400,
                 detail="Неверный формат параметра sort. Используйте 'currency_direction'.",
             )
+        descending = direction == "desc"
 
-    return filtered_products
+    # Фильтрация и сортировка выполняются в БД, а не в Python
+    try:
+        products = await products_get_with_filters(
+            AsyncSessionLocal,
+            search=search,
+            sort_currency=currency,
+            descending=descending,
+            has_image=has_image,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Товары уже провалидированы при чтении из БД - повторная проверка через
+    # response_model не нужна, сразу сериализуем список в JSON
+    return Response(
+        content=PRODUCT_LIST_ADAPTER.dump_json(products),
+        media_type="application/json",
+    )
 
 
 @router.post(
@@ -96,33 +132,19 @@ async def list_products(search: str = "", sort: str = "", has_image: bool = Fals
     summary="Создать новый товар",
     status_code=201,
 )
-async def create_product(product: CreateProduct, background_tasks: BackgroundTasks):
+async def create_product(product: ProductCreate):
     """
     Создает новый товар.
     """
-    # Так как мы не работаем с БД - нам нужно найти максимальный ID в текущем списке товаров и увеличить его на 1
-    new_product_id = max(item["id"] for item in products) + 1 if products else 1
-
-    # Преобразуем модель Pydantic в словарь. Валидация уже выполнена автоматически
-    new_product = product.model_dump()
-    new_product["id"] = new_product_id
-    products.append(new_product)
-
-    # Формируем сообщение для отправки в Telegram
-    telegram_message = f"""
-*Новый товар в магазине!*
-*Название:* {new_product['name']}
-*ID:* {new_product_id}
-*Описание:* {new_product['description']}
-http://127.0.0.1:8000/products/{new_product_id}
-
-```json
-{product.model_dump_json(indent=2, ensure_ascii=False)}
-```
-"""
-
-    # Фоновая задача - отправка уведомления в Telegram
-    background_tasks.add_task(send_telegram_message, telegram_message)
+    # ID выдаёт база данных
+    try:
+        new_product = await product_create(AsyncSessionLocal, product)
+    except ValueError as e:
+        # Не найдена категория или теги из запроса
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Уведомление в Telegram - только постановка в очередь, отправит фоновый воркер
+    enqueue_new_product_notification(new_product)
 
     return new_product
 
@@ -133,34 +155,36 @@ http://127.0.0.1:8000/products/{new_product_id}
     response_model=Product,
     summary="Обновить данные о товаре",
 )
-async def update_product(product_id: int, updated_product: CreateProduct):
+async def update_product(product_id: int, updated_product: ProductCreate):
     """
     Обновляет данные о товаре по его ID.
     """
-    # Формируем кортеж формата (индекс, товар) для каждого товара в списке
-    for index, item in enumerate(products):
-        # Мы нашли нужный товар по ID
-        if item["id"] == product_id:
-            # Обновляем товар, сохраняя его ID
-            updated_data = updated_product.model_dump()
-            updated_data["id"] = product_id
-            products[index] = updated_data
-            return products[index]
-    raise HTTPException(status_code=404, detail="Товар не найден")
+    # ID берём из пути, остальные поля - из тела запроса
+    product_data = ProductUpdate(id=product_id, **updated_product.model_dump())
+    try:
+        product = await product_update(AsyncSessionLocal, product_data)
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # Не найдена категория или теги из запроса
+        raise HTTPException(status_code=400, detail=str(e))
+    return product
 
 
 # DELETE
 @router.delete(
     "/delete/{product_id}",
-    response_model=int,
+    status_code=204,
+    response_class=Response,
     summary="Удалить товар",
 )
 async def delete_product(product_id: int):
     """
-    Удаляет товар по его ID.
+    Удаляет товар по его ID. При успехе возвращает 204 без тела.
     """
-    for index, item in enumerate(products):
-        if item["id"] == product_id:
-            products.pop(index)
-            return product_id
-    raise HTTPException(status_code=404, detail="Товар не найден")
+    try:
+        await product_delete(AsyncSessionLocal, product_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Товар не найден")
+    # ID клиент и так знает из URL - тело ответа не нужно
+    return Response(status_code=204)
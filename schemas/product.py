@@ -1,6 +1,20 @@
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 
+# Примеры для OpenAPI задаются целиком на модель через json_schema_extra,
+# а не через example= у каждого поля
+CATEGORY_EXAMPLE = {"id": 1, "name": "Портальные пушки"}
+TAG_EXAMPLE = {"id": 101, "name": "Новинка"}
+PRODUCT_CREATE_EXAMPLE = {
+    "name": "Смартфон 'Космос-X'",
+    "description": "Футуристический смартфон с прозрачным экраном и ИИ-помощником.",
+    "image_url": "https://example.com/images/kosmos-x.jpg",
+    "price_shmeckles": 999.99,
+    "price_flurbos": 120.50,
+    "category_id": 1,
+    "tag_ids": [101, 105],
+}
+
 
 class CategoryBase(BaseModel):
     """Базовая схема для категории."""
@@ -8,11 +22,14 @@ class CategoryBase(BaseModel):
     name: str = Field(
         ...,
         description="Название категории",
-        example="Портальные пушки",
         min_length=3,
         max_length=50,
     )
 
+    model_config = ConfigDict(
+        json_schema_extra={"examples": [{"name": CATEGORY_EXAMPLE["name"]}]}
+    )
+
 
 class CategoryCreate(CategoryBase):
     """Схема для создания новой категории."""
@@ -23,9 +40,11 @@ class CategoryCreate(CategoryBase):
 class Category(CategoryBase):
     """Схема для отображения категории, включая её ID из базы данных."""
 
-    id: int = Field(..., description="Уникальный идентификатор категории", example=1)
+    id: int = Field(..., description="Уникальный идентификатор категории")
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(
+        from_attributes=True, json_schema_extra={"examples": [CATEGORY_EXAMPLE]}
+    )
 
 
 class TagBase(BaseModel):
@@ -34,11 +53,14 @@ class TagBase(BaseModel):
     name: str = Field(
         ...,
         description="Название тега",
-        example="Новинка",
         min_length=2,
         max_length=30,
     )
 
+    model_config = ConfigDict(
+        json_schema_extra={"examples": [{"name": TAG_EXAMPLE["name"]}]}
+    )
+
 
 class TagCreate(TagBase):
     """Схема для создания нового тега."""
@@ -49,9 +71,11 @@ class TagCreate(TagBase):
 class Tag(TagBase):
     """Схема для отображения тега, включая его ID из базы данных."""
 
-    id: int = Field(..., description="Уникальный идентификатор тега", example=101)
+    id: int = Field(..., description="Уникальный идентификатор тега")
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(
+        from_attributes=True, json_schema_extra={"examples": [TAG_EXAMPLE]}
+    )
 
 
 class ProductCreate(BaseModel):
@@ -60,45 +84,40 @@ class ProductCreate(BaseModel):
     name: str = Field(
         ...,
         description="Название продукта",
-        example="Смартфон 'Космос-X'",
         min_length=3,
         max_length=100,
     )
     description: Optional[str] = Field(
         None,
         description="Подробное описание продукта",
-        example="Футуристический смартфон с прозрачным экраном и ИИ-помощником.",
         max_length=1000,
     )
     image_url: Optional[str] = Field(
         None,
         description="URL-адрес изображения продукта",
-        example="https://example.com/images/kosmos-x.jpg",
         max_length=255,
     )
     price_shmeckles: float = Field(
         ...,
         description="Цена продукта в Шмеклях",
-        example=999.99,
         gt=0,  # gt = greater than
     )
     price_flurbos: float = Field(
         ...,
         description="Цена продукта в Флёрбосах",
-        example=120.50,
         gt=0,
     )
     category_id: Optional[int] = Field(
         None,
         description="ID категории, к которой относится продукт",
-        example=1,
     )
     tag_ids: List[int] = Field(
-        [],
+        default_factory=list,
         description="Список ID тегов, связанных с продуктом",
-        example=[101, 105],
     )
 
+    model_config = ConfigDict(json_schema_extra={"examples": [PRODUCT_CREATE_EXAMPLE]})
+
 
 class ProductUpdate(ProductCreate):
     """
@@ -106,45 +125,60 @@ class ProductUpdate(ProductCreate):
     Все поля обязательны, как при создании.
     """
 
-    id: int = Field(..., description="ID продукта, который нужно обновить", example=42)
+    id: int = Field(..., description="ID продукта, который нужно обновить")
+
+    model_config = ConfigDict(
+        json_schema_extra={"examples": [{"id": 42, **PRODUCT_CREATE_EXAMPLE}]}
+    )
 
 
 class Product(BaseModel):
     """Схема для отображения продукта со всеми связанными данными из БД."""
 
-    id: int = Field(..., description="Уникальный идентификатор продукта", example=42)
+    id: int = Field(..., description="Уникальный идентификатор продукта")
     name: str = Field(
         ...,
         description="Название продукта",
-        example="Смартфон 'Космос-X'",
     )
     description: Optional[str] = Field(
         None,
         description="Подробное описание продукта",
-        example="Футуристический смартфон с прозрачным экраном и ИИ-помощником.",
     )
     image_url: Optional[str] = Field(
         None,
         description="URL-адрес изображения продукта",
-        example="https://example.com/images/kosmos-x.jpg",
     )
     price_shmeckles: float = Field(
         ...,
         description="Цена продукта в Шмеклях",
-        example=999.99,
     )
     price_flurbos: float = Field(
         ...,
         description="Цена продукта в Флёрбосах",
-        example=120.50,
     )
     category: Optional[Category] = Field(
         None,
         description="Категория продукта (вложенный объект)",
     )
     tags: List[Tag] = Field(
-        [],
+        default_factory=list,
         description="Список тегов продукта (вложенные объекты)",
     )
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "examples": [
+                {
+                    "id": 42,
+                    "name": PRODUCT_CREATE_EXAMPLE["name"],
+                    "description": PRODUCT_CREATE_EXAMPLE["description"],
+                    "image_url": PRODUCT_CREATE_EXAMPLE["image_url"],
+                    "price_shmeckles": PRODUCT_CREATE_EXAMPLE["price_shmeckles"],
+                    "price_flurbos": PRODUCT_CREATE_EXAMPLE["price_flurbos"],
+                    "category": CATEGORY_EXAMPLE,
+                    "tags": [TAG_EXAMPLE],
+                }
+            ]
+        },
+    )
@@ -1,27 +1,251 @@
 # utils/telegram.py
+import asyncio
 import logging
+from typing import Optional
+
 import telegram
+from telegram.helpers import escape_markdown
 from core.config import settings
+from schemas.product import Product
+
+# Логгер модуля. Уровень и обработчики настраиваются в приложении (main.py)
+logger = logging.getLogger(__name__)
+
+# Один бот на процесс - его HTTP-клиент и соединения с Telegram переиспользуются
+_bot: Optional[telegram.Bot] = None
+
+
+async def _get_bot() -> telegram.Bot:
+    """Получение общего экземпляра бота (создаётся при первой отправке)"""
+    global _bot
+    if _bot is None:
+        bot = telegram.Bot(token=settings.TELEGRAM_BOT_API_KEY)
+        # initialize открывает HTTP-клиент и один раз проверяет токен
+        await bot.initialize()
+        _bot = bot
+    return _bot
 
-# Настройка логирования
-logging.basicConfig(level=logging.DEBUG)
+
+async def close_telegram_bot() -> None:
+    """Закрытие HTTP-клиента бота (при остановке приложения)"""
+    global _bot
+    if _bot is not None:
+        await _bot.shutdown()
+        _bot = None
 
 
 async def send_telegram_message(message: str, parse_mode: str = "Markdown"):
     """Отправка сообщения в Telegram через бота"""
     try:
-        bot = telegram.Bot(token=settings.TELEGRAM_BOT_API_KEY)
-        # Имитируем более длительную асинхронную операцию
+        bot = await _get_bot()
         await bot.send_message(
             chat_id=settings.TELEGRAM_USER_ID, text=message, parse_mode=parse_mode
         )
-        logging.info(
-            f'Сообщение "{message}" отправлено в чат {settings.TELEGRAM_USER_ID}'
+        # %-форматирование: строка собирается, только если уровень логирования включён
+        logger.info(
+            'Сообщение "%s" отправлено в чат %s', message, settings.TELEGRAM_USER_ID
         )
     except Exception as e:
-        logging.error(
-            f"Ошибка отправки сообщения в чат {settings.TELEGRAM_USER_ID}: {e}"
+        logger.error(
+            "Ошибка отправки сообщения в чат %s: %s", settings.TELEGRAM_USER_ID, e
         )
         raise
     else:
-        logging.debug(f"Сообщение успешно отправлено: {message}")
+        logger.debug("Сообщение успешно отправлено: %s", message)
+
+
+# --- Очередь уведомлений о новых товарах ---
+# Маршрут только кладёт товар в очередь, а один фоновый воркер собирает товары
+# в пачки и отправляет их в Telegram. Зависание Telegram не держит задачи запросов.
+
+# Максимальный размер очереди - при переполнении новые уведомления отбрасываются
+NOTIFICATION_QUEUE_SIZE = 1000
+# Сколько товаров максимум объединяется в одну пачку
+NOTIFICATION_BATCH_SIZE = 10
+# Сколько секунд ждём добора пачки после первого товара
+NOTIFICATION_BATCH_TIMEOUT = 0.5
+# Ограничение Telegram на длину одного сообщения
+TELEGRAM_MESSAGE_LIMIT = 4096
+# Сколько секунд при остановке ждём отправки оставшихся уведомлений
+NOTIFICATION_SHUTDOWN_TIMEOUT = 5.0
+
+# None в очереди - сигнал воркеру: отправить оставшееся и завершиться
+_notification_queue: Optional[asyncio.Queue[Optional[Product]]] = None
+_notification_worker_task: Optional[asyncio.Task] = None
+
+
+# Шаблон уведомления разбирается один раз, при импорте модуля
+NEW_PRODUCT_TEMPLATE = """
+*Новый товар в магазине!*
+*Название:* {name}
+*ID:* {id}
+*Описание:* {description}
+http://127.0.0.1:8000/products/{id}
+
+```json
+{json}
+```
+"""
+
+
+def _format_new_product_message(product: Product) -> str:
+    """Формирование текста уведомления о новом товаре (не длиннее лимита Telegram)"""
+    # Пользовательские поля экранируем - иначе "_" или "*" в названии ломают разметку
+    fields = dict(
+        name=escape_markdown(product.name, version=1),
+        id=product.id,
+        description=escape_markdown(str(product.description), version=1),
+    )
+    # model_dump_json сериализует в Rust (pydantic-core), без промежуточного dict
+    product_json = product.model_dump_json()
+    message = NEW_PRODUCT_TEMPLATE.format(json=product_json, **fields)
+
+    overflow = len(message) - TELEGRAM_MESSAGE_LIMIT
+    if overflow > 0:
+        # Обрезаем JSON: внутри блока кода обрыв строки разметку не ломает
+        product_json = product_json[: max(len(product_json) - overflow - 1, 0)] + "…"
+        message = NEW_PRODUCT_TEMPLATE.format(json=product_json, **fields)
+    return message[:TELEGRAM_MESSAGE_LIMIT]
+
+
+def _join_messages(parts: list[str]) -> list[list[str]]:
+    """Группировка уведомлений в как можно меньшее число сообщений в пределах лимита Telegram"""
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_len = 0
+    for part in parts:
+        if current and current_len + len(part) > TELEGRAM_MESSAGE_LIMIT:
+            groups.append(current)
+            current, current_len = [], 0
+        current.append(part)
+        current_len += len(part)
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def _send_joined(parts: list[str]) -> None:
+    """Отправка группы уведомлений одним сообщением, при ошибке - по одному"""
+    try:
+        await send_telegram_message("".join(parts))
+        return
+    except Exception:
+        # Ошибка уже залогирована
+        if len(parts) == 1:
+            return
+    # Одно неудачное уведомление не должно терять остальные из пачки
+    for part in parts:
+        try:
+            await send_telegram_message(part)
+        except Exception:
+            pass
+
+
+def enqueue_new_product_notification(product: Product) -> None:
+    """Постановка уведомления о новом товаре в очередь (без ожидания)"""
+    if _notification_queue is None:
+        logger.warning(
+            "Воркер уведомлений не запущен, уведомление о товаре ID=%s пропущено",
+            product.id,
+        )
+        return
+    try:
+        _notification_queue.put_nowait(product)
+    except asyncio.QueueFull:
+        logger.warning(
+            "Очередь уведомлений переполнена, уведомление о товаре ID=%s пропущено",
+            product.id,
+        )
+
+
+async def _notification_worker(queue: asyncio.Queue[Optional[Product]]) -> None:
+    """Цикл воркера: собираем пачку товаров из очереди и отправляем её, до сигнала None"""
+    loop = asyncio.get_running_loop()
+    # Товары, взятые из очереди, но ещё не отправленные
+    batch: list[Product] = []
+    try:
+        stopping = False
+        while not stopping:
+            # Ждём первый товар, затем добираем пачку в течение NOTIFICATION_BATCH_TIMEOUT
+            product = await queue.get()
+            if product is None:
+                break
+            batch.append(product)
+            deadline = loop.time() + NOTIFICATION_BATCH_TIMEOUT
+            while len(batch) < NOTIFICATION_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    product = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if product is None:
+                    # Остановка: эту пачку ещё отправляем, затем выходим
+                    stopping = True
+                    break
+                batch.append(product)
+
+            parts = [_format_new_product_message(product) for product in batch]
+            # Ошибки отправки логируются и не останавливают воркер
+            for group in _join_messages(parts):
+                await _send_joined(group)
+                del batch[: len(group)]
+    except asyncio.CancelledError:
+        lost = len(batch) + sum(item is not None for item in _drain_queue(queue))
+        if lost:
+            logger.warning("При остановке не отправлено уведомлений: %s", lost)
+        raise
+
+
+def _drain_queue(queue: asyncio.Queue[Optional[Product]]) -> list[Optional[Product]]:
+    """Извлечение всех элементов очереди без ожидания"""
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def start_notification_worker() -> None:
+    """Создание очереди и запуск воркера уведомлений (при старте приложения)"""
+    global _notification_queue, _notification_worker_task
+    _notification_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+    _notification_worker_task = asyncio.create_task(
+        _notification_worker(_notification_queue)
+    )
+
+
+async def _finish_notification_worker(
+    queue: asyncio.Queue[Optional[Product]], task: asyncio.Task
+) -> None:
+    """Сигнал остановки в конец очереди и ожидание, пока воркер отправит всё до него"""
+    await queue.put(None)
+    await task
+
+
+async def stop_notification_worker() -> None:
+    """
+    Остановка воркера уведомлений (при остановке приложения).
+    Новые уведомления больше не принимаются, уже поставленные в очередь
+    отправляются - не дольше NOTIFICATION_SHUTDOWN_TIMEOUT секунд.
+    """
+    global _notification_queue, _notification_worker_task
+    queue, task = _notification_queue, _notification_worker_task
+    if queue is None or task is None:
+        return
+    _notification_queue = None
+    _notification_worker_task = None
+
+    try:
+        await asyncio.wait_for(
+            _finish_notification_worker(queue, task), NOTIFICATION_SHUTDOWN_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        # wait_for отменяет ожидание вместе с воркером - потери он залогирует сам
+        logger.warning(
+            "Воркер уведомлений не успел завершиться за %s с",
+            NOTIFICATION_SHUTDOWN_TIMEOUT,
+        )
+    if not task.done():
+        task.cancel()
+    await asyncio.gather(task, return_exceptions=True)